@@ -16,19 +16,44 @@ Examples:
     python playlist.py my_playlist.json
 """
 
+from __future__ import annotations
+
+import atexit
+import functools
+import heapq
+import io
+import itertools
 import json
-import re
+import os
 import sys
-
-import requests
-import spotipy
-from bs4 import BeautifulSoup
-from spotipy.oauth2 import SpotifyOAuth
+import tempfile
+import threading
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from operator import attrgetter
+from pathlib import Path
+from typing import TYPE_CHECKING, TypeVar
+
+import platformdirs
+
+# spotipy, lxml and requests-cache are imported where they are first used, so
+# the CLI doesn't pay their import cost just to print usage or validate args.
+if TYPE_CHECKING:
+    import requests_cache
+    import spotipy
+    from lxml import etree
 
 KWORB_BASE = "https://kworb.net/spotify"
 VALID_DECADES = {1960, 1970, 1980, 1990, 2000, 2005, 2010, 2015, 2020, 2025}
 VALID_YEAR_RANGE = range(2016, 2027)
+_VALID_PERIODS = frozenset(VALID_DECADES) | frozenset(VALID_YEAR_RANGE)
 SCOPE = "playlist-modify-public playlist-modify-private"
+CACHE_DIR = platformdirs.user_cache_path("spotify-playlist")
+SEARCH_CACHE_PATH = CACHE_DIR / "query_to_uri.json"
+_STRIP_NUMBER_SEPARATORS = str.maketrans("", "", ", \t\n\r\xa0")
+
+T = TypeVar("T")
 
 
 # --- Spotify helpers ---
@@ -37,6 +62,9 @@ SCOPE = "playlist-modify-public playlist-modify-private"
 def get_spotify_client() -> spotipy.Spotify:
     """Authenticate via env vars SPOTIPY_CLIENT_ID, SPOTIPY_CLIENT_SECRET,
     SPOTIPY_REDIRECT_URI and return a Spotify client."""
+    import spotipy
+    from spotipy.oauth2 import SpotifyOAuth
+
     auth = SpotifyOAuth(scope=SCOPE)
     return spotipy.Spotify(auth_manager=auth)
 
@@ -55,6 +83,72 @@ def search_track(sp, query: str) -> dict | None:
     }
 
 
+def _search_cache_key(query: str) -> str:
+    return " ".join(query.lower().split())
+
+
+@functools.cache
+def _load_search_cache() -> dict[str, dict | None]:
+    """Load the persistent query -> track cache once per run.
+
+    Misses are stored as None so unresolvable queries aren't retried on every run.
+    The cache is written back once, at interpreter exit.
+    """
+    try:
+        with open(SEARCH_CACHE_PATH) as f:
+            cache = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        cache = {}
+    if not isinstance(cache, dict):
+        cache = {}
+    atexit.register(_save_search_cache, cache, SEARCH_CACHE_PATH, dict(cache))
+    return cache
+
+
+def _save_search_cache(
+    cache: dict[str, dict | None], path: Path, loaded: dict[str, dict | None]
+) -> None:
+    """Write the cache back if it changed since `loaded`.
+
+    The file is replaced atomically so an interrupted write can't truncate it.
+    """
+    if cache == loaded:
+        return
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with tempfile.NamedTemporaryFile(
+        "w", dir=path.parent, suffix=".tmp", delete=False
+    ) as f:
+        tmp_path = Path(f.name)
+        try:
+            json.dump(cache, f)
+        except BaseException:
+            f.close()
+            tmp_path.unlink()
+            raise
+    os.replace(tmp_path, path)
+
+
+def search_tracks_batch(
+    sp, queries: list[str], max_concurrency: int = 8
+) -> list[dict | None]:
+    """Search Spotify for many tracks concurrently. Results keep query order.
+
+    Queries already in the persistent search cache (hits or misses) skip the API,
+    and duplicate queries are only searched once.
+    """
+    cache = _load_search_cache()
+    keys = [_search_cache_key(q) for q in queries]
+    pending = {}
+    for query, key in zip(queries, keys):
+        if key not in cache:
+            pending.setdefault(key, query)
+    with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+        results = executor.map(lambda q: search_track(sp, q), pending.values())
+        for key, result in zip(pending, results):
+            cache[key] = result
+    return [cache[key] for key in keys]
+
+
 def create_playlist(sp, name: str, description: str = "", public: bool = True) -> dict:
     """Create a playlist for the current user."""
     user_id = sp.current_user()["id"]
@@ -63,10 +157,15 @@ def create_playlist(sp, name: str, description: str = "", public: bool = True) -
     )
 
 
-def add_tracks_to_playlist(sp, playlist_id: str, track_uris: list[str]) -> None:
-    """Add tracks to a playlist in batches of 100."""
-    for i in range(0, len(track_uris), 100):
-        sp.playlist_add_items(playlist_id, track_uris[i : i + 100])
+def add_tracks_to_playlist(sp, playlist_id: str, track_uris: Iterable[str]) -> None:
+    """Add tracks to a playlist in batches of 100.
+
+    Spotify only preserves order within a single request, so batches are sent one
+    at a time to keep the playlist in rank order.
+    """
+    uris = iter(track_uris)
+    for batch in iter(lambda: list(itertools.islice(uris, 100)), []):
+        sp.playlist_add_items(playlist_id, batch)
 
 
 def _authenticate(sp) -> None:
@@ -79,61 +178,151 @@ def _authenticate(sp) -> None:
 # --- Kworb scraping ---
 
 
-def fetch_page(url: str) -> BeautifulSoup:
-    """Fetch HTML page and return parsed BeautifulSoup."""
-    resp = requests.get(url, timeout=30)
+@dataclass(slots=True, frozen=True)
+class ArtistSong:
+    """A song row from a kworb artist page."""
+
+    name: str
+    uri: str
+    daily: int
+
+
+@dataclass(slots=True, frozen=True)
+class ChartEntry:
+    """A song row from a kworb songs chart, as an artist-title search query."""
+
+    query: str
+    daily: int
+
+
+@functools.cache
+def _get_session() -> requests_cache.CachedSession:
+    """Return the shared HTTP session for kworb.net, creating it on first use.
+
+    kworb.net updates at most daily; repeat runs are served from disk, and stale
+    entries are revalidated via the server's Cache-Control/ETag headers.
+    """
+    import requests_cache
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    session = requests_cache.CachedSession(
+        str(CACHE_DIR / "kworb"),
+        backend="sqlite",
+        expire_after=3600,
+        cache_control=True,
+    )
+    session.mount(
+        "https://",
+        HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=8,
+            max_retries=Retry(
+                total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504]
+            ),
+        ),
+    )
+    return session
+
+
+def fetch_page(url: str) -> bytes:
+    """Fetch HTML page and return the response body for the parser.
+
+    If the Content-Type header names a charset, the body is transcoded to UTF-8
+    with a BOM, which libxml2 honours over any <meta> tag. Otherwise the raw bytes
+    are returned and libxml2 reads the page's own <meta charset>.
+    """
+    resp = _get_session().get(url, timeout=30)
     resp.raise_for_status()
-    return BeautifulSoup(resp.text, "html.parser")
+    if "charset=" in resp.headers.get("Content-Type", "").lower():
+        return resp.text.encode("utf-8-sig")
+    return resp.content
 
 
-def parse_artist_songs(soup: BeautifulSoup, limit: int) -> list[dict]:
-    """Parse artist page table, extract song name + Spotify track URI + daily streams.
+def _iter_table_rows(content: bytes) -> Iterator[list[etree._Element]]:
+    """Stream the body rows of the first `table.sortable`, yielding their <td> cells.
 
-    Returns top `limit` entries sorted by daily streams descending.
+    Rows may sit in a <tbody> or directly under the table (libxml2 doesn't add an
+    implied <tbody>); header rows without <td> cells are skipped. Rows are freed
+    once the caller moves on, so memory stays flat regardless of page size.
     """
-    table = soup.find("table", class_="sortable")
-    if not table:
+    from lxml import etree
+
+    table = None
+    for event, elem in etree.iterparse(
+        io.BytesIO(content),
+        events=("start", "end"),
+        tag=("table", "tr"),
+        html=True,
+    ):
+        if elem.tag == "table":
+            if event == "start" and table is None:
+                if "sortable" in elem.get("class", "").split():
+                    table = elem
+            elif event == "end" and elem is table:
+                break
+            continue
+        if event != "end" or table is None:
+            continue
+        parent = elem.getparent()
+        if parent is not table and (
+            parent.tag != "tbody" or parent.getparent() is not table
+        ):
+            continue
+        if cells := elem.findall("td"):
+            yield cells
+        elem.clear()
+        while elem.getprevious() is not None:
+            del parent[0]
+
+    if table is None:
         raise ValueError("Could not find songs table on page")
 
-    rows = []
-    for tr in table.find("tbody").find_all("tr"):
-        cells = tr.find_all("td")
-        link = cells[0].find("a")
-        if not link:
+
+def _text(elem: etree._Element) -> str:
+    """Return an element's text content, skipping the tree walk for leaf nodes."""
+    if not len(elem):
+        return elem.text or ""
+    return "".join(elem.itertext())
+
+
+def _iter_artist_songs(content: bytes) -> Iterator[ArtistSong]:
+    for cells in _iter_table_rows(content):
+        link = next(cells[0].iter("a"), None)
+        if link is None:
             continue
-        name = link.get_text(strip=True)
-        href = link["href"]
-        track_id = href.rstrip("/").split("/")[-1]
+        name = _text(link).strip()
+        track_id = link.get("href").rstrip("/").rsplit("/", 1)[-1]
         uri = f"spotify:track:{track_id}"
-        daily_text = cells[2].get_text(strip=True).replace(",", "")
+        daily_text = _text(cells[2]).translate(_STRIP_NUMBER_SEPARATORS)
         if not daily_text:
             continue
-        rows.append({"name": name, "uri": uri, "daily": int(daily_text)})
+        yield ArtistSong(name, uri, int(daily_text))
 
-    rows.sort(key=lambda r: r["daily"], reverse=True)
-    return rows[:limit]
 
-
-def parse_songs_chart(soup: BeautifulSoup, limit: int) -> list[dict]:
-    """Parse songs chart page table, extract artist-title query + daily streams.
+def parse_artist_songs(content: bytes, limit: int) -> list[ArtistSong]:
+    """Parse artist page table, extract song name + Spotify track URI + daily streams.
 
     Returns top `limit` entries sorted by daily streams descending.
     """
-    table = soup.find("table", class_="sortable")
-    if not table:
-        raise ValueError("Could not find songs table on page")
+    return heapq.nlargest(limit, _iter_artist_songs(content), key=attrgetter("daily"))
 
-    rows = []
-    for tr in table.find("tbody").find_all("tr"):
-        cells = tr.find_all("td")
-        query = cells[0].get_text(strip=True)
-        daily_text = cells[2].get_text(strip=True).replace(",", "")
+
+def _iter_chart_entries(content: bytes) -> Iterator[ChartEntry]:
+    for cells in _iter_table_rows(content):
+        query = _text(cells[0]).strip()
+        daily_text = _text(cells[2]).translate(_STRIP_NUMBER_SEPARATORS)
         if not daily_text:
             continue
-        rows.append({"query": query, "daily": int(daily_text)})
+        yield ChartEntry(query, int(daily_text))
+
+
+def parse_songs_chart(content: bytes, limit: int) -> list[ChartEntry]:
+    """Parse songs chart page table, extract artist-title query + daily streams.
 
-    rows.sort(key=lambda r: r["daily"], reverse=True)
-    return rows[:limit]
+    Returns top `limit` entries sorted by daily streams descending.
+    """
+    return heapq.nlargest(limit, _iter_chart_entries(content), key=attrgetter("daily"))
 
 
 def get_artist_id(sp, artist_name: str) -> str:
@@ -164,15 +353,31 @@ def is_period(arg: str) -> bool:
     """Check if argument is a valid time period (all_time, year, or decade)."""
     if arg == "all_time":
         return True
-    if re.fullmatch(r"\d+", arg):
-        num = int(arg)
-        return num in VALID_DECADES or num in VALID_YEAR_RANGE
-    return False
+    return arg.isdecimal() and int(arg) in _VALID_PERIODS
 
 
 # --- Orchestrators ---
 
 
+def _run_in_background(fn: Callable[[], T]) -> Future[T]:
+    """Run `fn` on a daemon thread and return a future for its result.
+
+    Unlike an executor's workers, the thread is not joined at interpreter exit.
+    """
+    future: Future[T] = Future()
+
+    def run() -> None:
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            future.set_result(fn())
+        except Exception as exc:  # noqa: BLE001 - forwarded to the caller
+            future.set_exception(exc)
+
+    threading.Thread(target=run, daemon=True).start()
+    return future
+
+
 def create_artist_playlist(artist_name: str, limit: int) -> None:
     """Create a playlist of an artist's top daily streamed songs from kworb.net."""
     sp = get_spotify_client()
@@ -183,16 +388,16 @@ def create_artist_playlist(artist_name: str, limit: int) -> None:
 
     url = build_kworb_artist_url(artist_id)
     print(f"Fetching kworb.net data: {url}")
-    soup = fetch_page(url)
+    content = fetch_page(url)
 
-    songs = parse_artist_songs(soup, limit)
+    songs = parse_artist_songs(content, limit)
     if not songs:
         print("No songs found on kworb.net for this artist.")
         return
 
     print(f"\nTop {len(songs)} songs by daily streams:")
     for i, s in enumerate(songs, 1):
-        print(f"  {i:3d}. {s['name']} ({s['daily']:,}/day)")
+        print(f"  {i:3d}. {s.name} ({s.daily:,}/day)")
 
     playlist_name = f"{artist_name} - Top Daily Streams"
     playlist = create_playlist(
@@ -200,38 +405,40 @@ def create_artist_playlist(artist_name: str, limit: int) -> None:
         playlist_name,
         f"Top {limit} daily streamed songs for {artist_name} from kworb.net",
     )
-    track_uris = [s["uri"] for s in songs]
-    add_tracks_to_playlist(sp, playlist["id"], track_uris)
+    add_tracks_to_playlist(sp, playlist["id"], (s.uri for s in songs))
 
     print(f"\nDone! '{playlist_name}' is ready with {len(songs)} tracks.")
 
 
 def create_period_playlist(period: str, limit: int) -> None:
     """Create a playlist of top daily streamed songs for a time period."""
-    sp = get_spotify_client()
-    _authenticate(sp)
-
     url = build_kworb_songs_url(period)
     print(f"Fetching kworb.net data: {url}")
-    soup = fetch_page(url)
+    # The chart doesn't depend on Spotify, so fetch and parse it while
+    # authenticating. The fetch runs on a daemon thread, so a failed login exits
+    # without waiting for it.
+    chart = _run_in_background(lambda: parse_songs_chart(fetch_page(url), limit))
+    sp = get_spotify_client()
+    _authenticate(sp)
+    entries = chart.result()
 
-    entries = parse_songs_chart(soup, limit)
     if not entries:
         print("No songs found on kworb.net for this period.")
         return
 
     print(f"\nTop {len(entries)} songs by daily streams:")
     for i, e in enumerate(entries, 1):
-        print(f"  {i:3d}. {e['query']} ({e['daily']:,}/day)")
+        print(f"  {i:3d}. {e.query} ({e.daily:,}/day)")
 
     print("\nSearching for tracks on Spotify...")
+    results = search_tracks_batch(sp, [e.query for e in entries])
     track_uris = []
-    for e in entries:
-        if result := search_track(sp, e["query"]):
+    for e, result in zip(entries, results):
+        if result:
             track_uris.append(result["uri"])
             print(f"  Found: {result['name']} -- {result['artist']}")
         else:
-            print(f"  Not found: {e['query']}")
+            print(f"  Not found: {e.query}")
 
     if not track_uris:
         print("\nNo tracks found on Spotify. Playlist not created.")
@@ -259,9 +466,10 @@ def create_json_playlist(filepath: str) -> None:
     _authenticate(sp)
 
     print(f"Searching for {len(data['songs'])} tracks on Spotify...")
+    results = search_tracks_batch(sp, data["songs"])
     track_uris = []
-    for query in data["songs"]:
-        if result := search_track(sp, query):
+    for query, result in zip(data["songs"], results):
+        if result:
             track_uris.append(result["uri"])
             print(f"  Found: {result['name']} -- {result['artist']}")
         else:
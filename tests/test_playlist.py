@@ -1,12 +1,19 @@
+import atexit
 import json
 import sys
+import threading
 from unittest.mock import MagicMock, patch
 
 import pytest
-from bs4 import BeautifulSoup
+import requests
 
+from spotify import playlist
 from spotify.playlist import (
+    ArtistSong,
+    ChartEntry,
     _authenticate,
+    _load_search_cache,
+    _save_search_cache,
     add_tracks_to_playlist,
     build_kworb_artist_url,
     build_kworb_songs_url,
@@ -22,13 +29,25 @@ from spotify.playlist import (
     parse_artist_songs,
     parse_songs_chart,
     search_track,
+    search_tracks_batch,
 )
 
 
+@pytest.fixture(autouse=True)
+def search_cache_path(tmp_path, monkeypatch):
+    """Point the persistent search cache at a temp file for every test."""
+    path = tmp_path / "cache" / "query_to_uri.json"
+    monkeypatch.setattr(playlist, "SEARCH_CACHE_PATH", path)
+    _load_search_cache.cache_clear()
+    yield path
+    atexit.unregister(_save_search_cache)
+    _load_search_cache.cache_clear()
+
+
 # --- HTML fixtures ---
 
 
-def _artist_html(rows: list[tuple[str, str, str]]) -> BeautifulSoup:
+def _artist_html(rows: list[tuple[str, str, str]]) -> bytes:
     """Build a minimal kworb artist page.
 
     Each row is (song_name, track_id, daily_streams).
@@ -37,12 +56,10 @@ def _artist_html(rows: list[tuple[str, str, str]]) -> BeautifulSoup:
     for name, track_id, daily in rows:
         link = f'<a href="/spotify/track/{track_id}/">{name}</a>' if track_id else name
         trs += f"<tr><td>{link}</td><td>1,000,000</td><td>{daily}</td></tr>\n"
-    return BeautifulSoup(
-        f'<table class="sortable"><tbody>{trs}</tbody></table>', "html.parser"
-    )
+    return f'<table class="sortable"><tbody>{trs}</tbody></table>'.encode()
 
 
-def _chart_html(rows: list[tuple[str, str]]) -> BeautifulSoup:
+def _chart_html(rows: list[tuple[str, str]]) -> bytes:
     """Build a minimal kworb songs chart page.
 
     Each row is (query, daily_streams).
@@ -50,9 +67,7 @@ def _chart_html(rows: list[tuple[str, str]]) -> BeautifulSoup:
     trs = ""
     for query, daily in rows:
         trs += f"<tr><td>{query}</td><td>1,000,000</td><td>{daily}</td></tr>\n"
-    return BeautifulSoup(
-        f'<table class="sortable"><tbody>{trs}</tbody></table>', "html.parser"
-    )
+    return f'<table class="sortable"><tbody>{trs}</tbody></table>'.encode()
 
 
 # --- Pure function tests ---
@@ -76,6 +91,8 @@ class TestIsPeriod:
         assert is_period("hello") is False
         assert is_period("Aphex Twin") is False
         assert is_period("") is False
+        assert is_period("-2020") is False
+        assert is_period("2020²") is False
 
     def test_out_of_range_number(self):
         assert is_period("1950") is False
@@ -108,112 +125,170 @@ class TestBuildKworbSongsUrl:
 
 class TestParseArtistSongs:
     def test_normal(self):
-        soup = _artist_html(
+        content = _artist_html(
             [
                 ("Song A", "aaa", "500"),
                 ("Song B", "bbb", "1,000"),
                 ("Song C", "ccc", "200"),
             ]
         )
-        result = parse_artist_songs(soup, 10)
+        result = parse_artist_songs(content, 10)
         assert len(result) == 3
-        assert result[0] == {
-            "name": "Song B",
-            "uri": "spotify:track:bbb",
-            "daily": 1000,
-        }
-        assert result[1] == {"name": "Song A", "uri": "spotify:track:aaa", "daily": 500}
-        assert result[2] == {"name": "Song C", "uri": "spotify:track:ccc", "daily": 200}
+        assert result[0] == ArtistSong("Song B", "spotify:track:bbb", 1000)
+        assert result[1] == ArtistSong("Song A", "spotify:track:aaa", 500)
+        assert result[2] == ArtistSong("Song C", "spotify:track:ccc", 200)
 
     def test_limit(self):
-        soup = _artist_html(
+        content = _artist_html(
             [
                 ("Song A", "aaa", "500"),
                 ("Song B", "bbb", "1,000"),
                 ("Song C", "ccc", "200"),
             ]
         )
-        result = parse_artist_songs(soup, 2)
+        result = parse_artist_songs(content, 2)
         assert len(result) == 2
 
     def test_sort_order(self):
-        soup = _artist_html(
+        content = _artist_html(
             [
                 ("Low", "low", "10"),
                 ("High", "high", "9,999"),
             ]
         )
-        result = parse_artist_songs(soup, 10)
-        assert result[0]["name"] == "High"
-        assert result[1]["name"] == "Low"
+        result = parse_artist_songs(content, 10)
+        assert result[0].name == "High"
+        assert result[1].name == "Low"
 
     def test_missing_link_skipped(self):
-        soup = _artist_html(
+        content = _artist_html(
             [
                 ("No Link", "", "500"),
                 ("Has Link", "abc", "300"),
             ]
         )
-        result = parse_artist_songs(soup, 10)
+        result = parse_artist_songs(content, 10)
         assert len(result) == 1
-        assert result[0]["name"] == "Has Link"
+        assert result[0].name == "Has Link"
 
     def test_missing_daily_skipped(self):
-        soup = _artist_html(
+        content = _artist_html(
             [
                 ("Song A", "aaa", ""),
                 ("Song B", "bbb", "300"),
             ]
         )
-        result = parse_artist_songs(soup, 10)
+        result = parse_artist_songs(content, 10)
         assert len(result) == 1
-        assert result[0]["name"] == "Song B"
+        assert result[0].name == "Song B"
+
+    def test_non_ascii_utf8_bom(self):
+        bom = b"\xef\xbb\xbf"
+        content = bom + _artist_html([("Beyoncé – Halo", "abc", "1,000")])
+        result = parse_artist_songs(content, 10)
+        assert result == [ArtistSong("Beyoncé – Halo", "spotify:track:abc", 1000)]
+
+    def test_href_without_trailing_slash(self):
+        content = (
+            b'<table class="wide sortable"><tbody><tr>'
+            b'<td><a href="https://open.spotify.com/track/xyz">Song</a></td>'
+            b"<td>1</td><td>42</td></tr></tbody></table>"
+        )
+        result = parse_artist_songs(content, 10)
+        assert result == [ArtistSong("Song", "spotify:track:xyz", 42)]
 
     def test_no_table_raises(self):
-        soup = BeautifulSoup("<html><body>No table here</body></html>", "html.parser")
+        content = b"<html><body>No table here</body></html>"
         with pytest.raises(ValueError, match="Could not find songs table"):
-            parse_artist_songs(soup, 10)
+            parse_artist_songs(content, 10)
 
 
 class TestParseSongsChart:
     def test_normal(self):
-        soup = _chart_html(
+        content = _chart_html(
             [
                 ("Artist - Song A", "500"),
                 ("Artist - Song B", "1,000"),
             ]
         )
-        result = parse_songs_chart(soup, 10)
+        result = parse_songs_chart(content, 10)
         assert len(result) == 2
-        assert result[0] == {"query": "Artist - Song B", "daily": 1000}
-        assert result[1] == {"query": "Artist - Song A", "daily": 500}
+        assert result[0] == ChartEntry("Artist - Song B", 1000)
+        assert result[1] == ChartEntry("Artist - Song A", 500)
 
     def test_limit(self):
-        soup = _chart_html(
+        content = _chart_html(
             [
                 ("A", "300"),
                 ("B", "200"),
                 ("C", "100"),
             ]
         )
-        result = parse_songs_chart(soup, 2)
+        result = parse_songs_chart(content, 2)
         assert len(result) == 2
 
     def test_sort_order(self):
-        soup = _chart_html([("Low", "1"), ("High", "999")])
-        result = parse_songs_chart(soup, 10)
-        assert result[0]["query"] == "High"
+        content = _chart_html([("Low", "1"), ("High", "999")])
+        result = parse_songs_chart(content, 10)
+        assert result[0].query == "High"
+
+    def test_daily_whitespace_and_commas(self):
+        content = _chart_html([("Song", "\n  12,345\t")])
+        result = parse_songs_chart(content, 10)
+        assert result == [ChartEntry("Song", 12345)]
+
+    def test_ties_keep_page_order(self):
+        content = _chart_html([("First", "100"), ("Top", "500"), ("Second", "100")])
+        result = parse_songs_chart(content, 2)
+        assert [r.query for r in result] == ["Top", "First"]
 
     def test_missing_daily_skipped(self):
-        soup = _chart_html([("Song", ""), ("Other", "100")])
-        result = parse_songs_chart(soup, 10)
+        content = _chart_html([("Song", ""), ("Other", "100")])
+        result = parse_songs_chart(content, 10)
         assert len(result) == 1
-        assert result[0]["query"] == "Other"
+        assert result[0].query == "Other"
+
+    def test_nested_markup_text(self):
+        content = _chart_html([("<div><a>Artist</a> - <a>Song</a></div>", "1,234")])
+        result = parse_songs_chart(content, 10)
+        assert result == [ChartEntry("Artist - Song", 1234)]
+
+    def test_non_ascii_meta_charset(self):
+        meta = b'<meta charset="utf-8">'
+        content = meta + _chart_html([("Beyoncé – Halo", "1,000")])
+        result = parse_songs_chart(content, 10)
+        assert result == [ChartEntry("Beyoncé – Halo", 1000)]
+
+    def test_rows_without_tbody(self):
+        content = (
+            b'<table class="sortable">'
+            b"<tr><th>Song</th><th>Total</th><th>Daily</th></tr>"
+            b"<tr><td>A</td><td>1</td><td>100</td></tr>"
+            b"<tr><td>B</td><td>1</td><td>200</td></tr>"
+            b"</table>"
+        )
+        result = parse_songs_chart(content, 10)
+        assert result == [ChartEntry("B", 200), ChartEntry("A", 100)]
+
+    def test_ignores_rows_outside_sortable_table(self):
+        content = (
+            b"<html><body>"
+            b"<table><tbody><tr><td>Nav</td><td>-</td><td>9,999</td></tr>"
+            b"</tbody></table>"
+            b'<table class="sortable"><tbody>'
+            b"<tr><td>Song</td><td>1</td><td>100</td></tr>"
+            b"</tbody></table>"
+            b"<table><tbody><tr><td>Footer</td><td>-</td><td>5,000</td></tr>"
+            b"</tbody></table>"
+            b"</body></html>"
+        )
+        result = parse_songs_chart(content, 10)
+        assert result == [ChartEntry("Song", 100)]
 
     def test_no_table_raises(self):
-        soup = BeautifulSoup("<html><body>Empty</body></html>", "html.parser")
+        content = b"<html><body>Empty</body></html>"
         with pytest.raises(ValueError, match="Could not find songs table"):
-            parse_songs_chart(soup, 10)
+            parse_songs_chart(content, 10)
 
 
 # --- Spotify API tests (MagicMock) ---
@@ -249,6 +324,113 @@ class TestSearchTrack:
         assert search_track(sp, "nonexistent") is None
 
 
+class TestSearchTracksBatch:
+    @patch("spotify.playlist.search_track")
+    def test_preserves_order(self, mock_search):
+        sp = MagicMock()
+        mock_search.side_effect = lambda sp, query: (
+            None if query == "missing" else {"uri": f"spotify:track:{query}"}
+        )
+        queries = [f"q{i}" for i in range(20)] + ["missing"]
+        result = search_tracks_batch(sp, queries, max_concurrency=4)
+        assert result[:20] == [{"uri": f"spotify:track:q{i}"} for i in range(20)]
+        assert result[20] is None
+        assert mock_search.call_count == 21
+
+    def test_empty(self):
+        assert search_tracks_batch(MagicMock(), []) == []
+
+    @patch("spotify.playlist.search_track")
+    def test_cached_queries_skip_search(self, mock_search):
+        cache = _load_search_cache()
+        cache["artist - song"] = {"uri": "spotify:track:cached"}
+        cache["unresolvable"] = None
+        mock_search.return_value = {"uri": "spotify:track:new"}
+
+        result = search_tracks_batch(
+            MagicMock(), ["Artist  - Song", "Unresolvable", "New"]
+        )
+
+        assert result == [
+            {"uri": "spotify:track:cached"},
+            None,
+            {"uri": "spotify:track:new"},
+        ]
+        mock_search.assert_called_once()
+        assert cache["new"] == {"uri": "spotify:track:new"}
+
+    @patch("spotify.playlist.search_track")
+    def test_duplicates_searched_once(self, mock_search):
+        mock_search.side_effect = lambda sp, query: {"uri": f"spotify:track:{query}"}
+        result = search_tracks_batch(MagicMock(), ["A", "B", "A", "a ", "B"])
+        assert [r["uri"] for r in result] == [
+            "spotify:track:A",
+            "spotify:track:B",
+            "spotify:track:A",
+            "spotify:track:A",
+            "spotify:track:B",
+        ]
+        assert sorted(c.args[1] for c in mock_search.call_args_list) == ["A", "B"]
+
+    @patch("spotify.playlist.search_track")
+    def test_misses_cached(self, mock_search):
+        mock_search.return_value = None
+        search_tracks_batch(MagicMock(), ["nothing"])
+        search_tracks_batch(MagicMock(), ["nothing"])
+        mock_search.assert_called_once()
+
+
+class TestSearchCachePersistence:
+    def test_round_trip(self, search_cache_path):
+        _save_search_cache(
+            {"q": {"uri": "spotify:track:x"}, "miss": None}, search_cache_path, {}
+        )
+        assert _load_search_cache() == {"q": {"uri": "spotify:track:x"}, "miss": None}
+
+    def test_exit_save_writes_to_load_path(
+        self, search_cache_path, tmp_path, monkeypatch
+    ):
+        with patch("spotify.playlist.atexit.register") as mock_register:
+            cache = _load_search_cache()
+        cache["q"] = None
+        other_path = tmp_path / "restored" / "query_to_uri.json"
+        monkeypatch.setattr(playlist, "SEARCH_CACHE_PATH", other_path)
+
+        save, *args = mock_register.call_args.args
+        save(*args)
+
+        assert json.loads(search_cache_path.read_text()) == {"q": None}
+        assert not other_path.exists()
+
+    def test_unchanged_cache_not_written(self, search_cache_path):
+        _save_search_cache({"q": None}, search_cache_path, {"q": None})
+        assert not search_cache_path.exists()
+
+    def test_save_replaces_file_atomically(self, search_cache_path):
+        search_cache_path.parent.mkdir(parents=True)
+        search_cache_path.write_text('{"old": null}')
+        with (
+            patch("spotify.playlist.json.dump", side_effect=OSError("disk full")),
+            pytest.raises(OSError, match="disk full"),
+        ):
+            _save_search_cache({"new": None}, search_cache_path, {})
+        assert search_cache_path.read_text() == '{"old": null}'
+        assert list(search_cache_path.parent.iterdir()) == [search_cache_path]
+
+    def test_missing_file(self):
+        assert _load_search_cache() == {}
+
+    def test_non_dict_file(self, search_cache_path):
+        search_cache_path.parent.mkdir(parents=True)
+        search_cache_path.write_text("[1, 2]")
+        assert _load_search_cache() == {}
+
+    def test_corrupt_file(self, search_cache_path):
+        search_cache_path.parent.mkdir(parents=True)
+        search_cache_path.write_text("{not json")
+        assert _load_search_cache() == {}
+
+
 class TestGetArtistId:
     def test_found(self):
         sp = MagicMock()
@@ -293,6 +475,30 @@ class TestAddTracksToPlaylist:
         sp.playlist_add_items.assert_any_call("pl1", uris[100:200])
         sp.playlist_add_items.assert_any_call("pl1", uris[200:250])
 
+    def test_accepts_generator(self):
+        sp = MagicMock()
+        uris = [f"spotify:track:{i}" for i in range(150)]
+        add_tracks_to_playlist(sp, "pl1", (u for u in uris))
+        assert [c.args[1] for c in sp.playlist_add_items.call_args_list] == [
+            uris[:100],
+            uris[100:],
+        ]
+
+    def test_empty(self):
+        sp = MagicMock()
+        add_tracks_to_playlist(sp, "pl1", [])
+        sp.playlist_add_items.assert_not_called()
+
+    def test_ordered_batches_sent_in_sequence(self):
+        sp = MagicMock()
+        uris = [f"spotify:track:{i}" for i in range(250)]
+        add_tracks_to_playlist(sp, "pl1", uris)
+        assert [c.args[1] for c in sp.playlist_add_items.call_args_list] == [
+            uris[:100],
+            uris[100:200],
+            uris[200:250],
+        ]
+
 
 class TestAuthenticate:
     def test_prints_user_info(self, capsys):
@@ -307,18 +513,52 @@ class TestAuthenticate:
 # --- Integration-level tests ---
 
 
+def _response(body: bytes, content_type: str) -> requests.Response:
+    """Build a response the way requests' adapter does, encoding included."""
+    resp = requests.Response()
+    resp.status_code = 200
+    resp._content = body
+    resp.headers["Content-Type"] = content_type
+    resp.encoding = requests.utils.get_encoding_from_headers(resp.headers)
+    return resp
+
+
 class TestFetchPage:
-    @patch("spotify.playlist.requests.get")
-    def test_returns_soup(self, mock_get):
-        mock_resp = MagicMock()
-        mock_resp.text = "<html><body><p>Hello</p></body></html>"
-        mock_resp.raise_for_status = MagicMock()
-        mock_get.return_value = mock_resp
+    @patch("spotify.playlist._get_session")
+    def test_returns_content(self, mock_session):
+        mock_get = mock_session.return_value.get
+        body = b"<html><body><p>Hello</p></body></html>"
+        mock_get.return_value = _response(body, "text/html")
         result = fetch_page("https://example.com")
-        assert isinstance(result, BeautifulSoup)
-        assert result.find("p").text == "Hello"
+        assert result == body
         mock_get.assert_called_once_with("https://example.com", timeout=30)
 
+    @patch("spotify.playlist._get_session")
+    def test_header_without_charset_uses_meta(self, mock_session):
+        body = b'<meta charset="utf-8">' + _chart_html([("Beyoncé – Halo", "1")])
+        mock_session.return_value.get.return_value = _response(body, "text/html")
+        result = parse_songs_chart(fetch_page("https://example.com"), 10)
+        assert result == [ChartEntry("Beyoncé – Halo", 1)]
+
+    @patch("spotify.playlist._get_session")
+    def test_header_charset_without_meta(self, mock_session):
+        body = _chart_html([("Beyoncé – Halo", "1")])
+        mock_session.return_value.get.return_value = _response(
+            body, "text/html; charset=utf-8"
+        )
+        result = parse_songs_chart(fetch_page("https://example.com"), 10)
+        assert result == [ChartEntry("Beyoncé – Halo", 1)]
+
+    @patch("spotify.playlist._get_session")
+    def test_header_charset_overrides_meta(self, mock_session):
+        html = '<meta charset="utf-8"><table class="sortable"><tbody>'
+        html += "<tr><td>Beyoncé</td><td>1</td><td>1</td></tr></tbody></table>"
+        mock_session.return_value.get.return_value = _response(
+            html.encode("latin-1"), "text/html; charset=ISO-8859-1"
+        )
+        result = parse_songs_chart(fetch_page("https://example.com"), 10)
+        assert result == [ChartEntry("Beyoncé", 1)]
+
 
 class TestMain:
     @patch("spotify.playlist.create_artist_playlist")
@@ -367,11 +607,20 @@ class TestCreateJsonPlaylist:
     ):
         sp = MagicMock()
         mock_client.return_value = sp
-        mock_search.side_effect = [
-            {"name": "Song A", "artist": "Artist A", "uri": "spotify:track:aaa"},
-            None,
-            {"name": "Song C", "artist": "Artist C", "uri": "spotify:track:ccc"},
-        ]
+        results = {
+            "Song A": {
+                "name": "Song A",
+                "artist": "Artist A",
+                "uri": "spotify:track:aaa",
+            },
+            "Song B": None,
+            "Song C": {
+                "name": "Song C",
+                "artist": "Artist C",
+                "uri": "spotify:track:ccc",
+            },
+        }
+        mock_search.side_effect = lambda sp, query: results[query]
         mock_create_pl.return_value = {"id": "pl1"}
 
         data = {
@@ -412,8 +661,8 @@ class TestCreateJsonPlaylist:
 
 
 class TestGetSpotifyClient:
-    @patch("spotify.playlist.SpotifyOAuth")
-    @patch("spotify.playlist.spotipy.Spotify")
+    @patch("spotipy.oauth2.SpotifyOAuth")
+    @patch("spotipy.Spotify")
     def test_returns_client(self, mock_spotify, mock_oauth):
         mock_auth = MagicMock()
         mock_oauth.return_value = mock_auth
@@ -451,7 +700,7 @@ class TestCreateArtistPlaylist:
         mock_aid.return_value = "artist123"
         mock_fetch.return_value = MagicMock()
         mock_parse.return_value = [
-            {"name": "Track A", "uri": "spotify:track:aaa", "daily": 500},
+            ArtistSong("Track A", "spotify:track:aaa", 500),
         ]
         mock_create_pl.return_value = {"id": "pl1"}
 
@@ -460,7 +709,9 @@ class TestCreateArtistPlaylist:
         mock_auth.assert_called_once_with(sp)
         mock_aid.assert_called_once_with(sp, "Aphex Twin")
         mock_create_pl.assert_called_once()
-        mock_add.assert_called_once_with(sp, "pl1", ["spotify:track:aaa"])
+        mock_add.assert_called_once()
+        add_sp, add_pl, add_uris = mock_add.call_args.args
+        assert (add_sp, add_pl, list(add_uris)) == (sp, "pl1", ["spotify:track:aaa"])
         assert "Done!" in capsys.readouterr().out
 
     @patch("spotify.playlist.get_spotify_client")
@@ -505,7 +756,7 @@ class TestCreatePeriodPlaylist:
         mock_client.return_value = sp
         mock_fetch.return_value = MagicMock()
         mock_parse.return_value = [
-            {"query": "Artist - Song", "daily": 1000},
+            ChartEntry("Artist - Song", 1000),
         ]
         mock_search.return_value = {
             "name": "Song",
@@ -521,6 +772,56 @@ class TestCreatePeriodPlaylist:
         mock_add.assert_called_once_with(sp, "pl1", ["spotify:track:aaa"])
         assert "Done!" in capsys.readouterr().out
 
+    @patch("spotify.playlist.get_spotify_client")
+    @patch("spotify.playlist._authenticate")
+    @patch("spotify.playlist.fetch_page")
+    @patch("spotify.playlist.parse_songs_chart")
+    def test_fetch_error_propagates(
+        self, mock_parse, mock_fetch, mock_auth, mock_client
+    ):
+        mock_client.return_value = MagicMock()
+        mock_fetch.side_effect = RuntimeError("kworb down")
+
+        with pytest.raises(RuntimeError, match="kworb down"):
+            create_period_playlist("2020", 10)
+
+        mock_parse.assert_not_called()
+
+    @patch("spotify.playlist.get_spotify_client")
+    @patch("spotify.playlist._authenticate")
+    @patch("spotify.playlist.fetch_page")
+    @patch("spotify.playlist.parse_songs_chart")
+    def test_auth_error_does_not_wait_for_fetch(
+        self, mock_parse, mock_fetch, mock_auth, mock_client, capsys
+    ):
+        started = threading.Event()
+        release = threading.Event()
+        finished = threading.Event()
+        fetch_daemon = []
+
+        def blocking_fetch(url):
+            fetch_daemon.append(threading.current_thread().daemon)
+            started.set()
+            release.wait(5)
+            finished.set()
+
+        def failing_client():
+            started.wait(5)
+            raise RuntimeError("auth failed")
+
+        mock_fetch.side_effect = blocking_fetch
+        mock_client.side_effect = failing_client
+
+        try:
+            with pytest.raises(RuntimeError, match="auth failed"):
+                create_period_playlist("2020", 10)
+            assert started.is_set()
+            assert not finished.is_set()
+            assert fetch_daemon == [True]
+        finally:
+            release.set()
+        assert "Fetching kworb.net data" in capsys.readouterr().out
+
     @patch("spotify.playlist.get_spotify_client")
     @patch("spotify.playlist._authenticate")
     @patch("spotify.playlist.fetch_page")
@@ -552,7 +853,7 @@ class TestCreatePeriodPlaylist:
         sp = MagicMock()
         mock_client.return_value = sp
         mock_fetch.return_value = MagicMock()
-        mock_parse.return_value = [{"query": "Unknown", "daily": 100}]
+        mock_parse.return_value = [ChartEntry("Unknown", 100)]
         mock_search.return_value = None
 
         create_period_playlist("2020", 10)
@@ -579,7 +880,7 @@ class TestCreatePeriodPlaylist:
         sp = MagicMock()
         mock_client.return_value = sp
         mock_fetch.return_value = MagicMock()
-        mock_parse.return_value = [{"query": "Song", "daily": 100}]
+        mock_parse.return_value = [ChartEntry("Song", 100)]
         mock_search.return_value = {
             "name": "Song",
             "artist": "A",